@@ -0,0 +1,359 @@
+import re
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PRIORITY_PROMPT = """
+You are a software project manager assistant. Given a user story or task and its context, evaluate its urgency and impact to recommend a **priority** (High, Medium, Low) for the team.
+
+Assess using:
+- Business value or customer impact
+- Deadlines or time sensitivity
+- Dependencies on or by other work
+- Risk of delay or failure
+- Effort or complexity
+- Alignment with strategic goals
+
+Return:
+---
+**Priority Recommendation:** <High/Medium/Low>
+
+**Rationale:**  
+<1-2 lines explaining your reasoning, referencing the input factors.>
+---
+
+User Story/Task: {user_story}
+Business Value/Impact: {business_value}
+Deadline/Time Sensitivity: {deadline}
+Dependencies: {dependencies}
+Risk: {risk}
+Effort/Complexity: {effort}
+Other Context: {other_context}
+"""
+
+PRIORITY_RE = re.compile(
+    r"\*\*Priority Recommendation:\*\*\s*(?P<prio>[^\n]+).*?\*\*Rationale:\*\*\s*(?P<rat>.+)",
+    re.DOTALL,
+)
+
+def clear_connection_state():
+    for k in [
+        "jira_host", "jira_email", "jira_api_token", "jira_project_key",
+        "connected", "last_priority_recommendation", "last_priority_rationale",
+        "last_selected_issue_key", "jira_client", "jira_prios_by_name"
+    ]:
+        if k in st.session_state:
+            del st.session_state[k]
+
+# On-disk LLM cache so identical prompts are answered across sessions and process restarts.
+# It is the only response cache and its entries never expire: delete the file to drop stale
+# recommendations (and the Jira issue text stored in the prompts).
+LLM_CACHE_PATH = "/tmp/llm_cache.db"
+
+# langchain (like jira) is imported where first used so the connect form renders
+# without paying its import cost on cold start.
+@st.cache_resource
+def get_prompt_template():
+    from langchain_core.prompts import PromptTemplate
+    return PromptTemplate.from_template(PRIORITY_PROMPT)
+
+# st.cache_resource (the successor of st.singleton) keeps one unhashable client per process.
+@st.cache_resource
+def get_llm():
+    from langchain_core.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+    from langchain_openai import ChatOpenAI
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+    return ChatOpenAI(model="gpt-4o", temperature=0, streaming=True, api_key=st.secrets["OPENAI_API_KEY"])
+
+@st.cache_resource
+def get_chain():
+    from langchain_core.output_parsers import StrOutputParser
+    return get_prompt_template() | get_llm() | StrOutputParser()
+
+def llm_cache_key(inputs):
+    # BaseChatModel.stream never touches the LLM cache, so the streamed path reads and fills
+    # it by hand. This mirrors langchain_core's BaseChatModel._generate_with_cache: the prompt
+    # key is dumps() of the chat messages and the model key is _get_llm_string(). Both are
+    # private details, so keep this in step with that method when upgrading langchain-core.
+    from langchain_core.load import dumps
+    messages = get_prompt_template().format_prompt(**inputs).to_messages()
+    return dumps(messages), get_llm()._get_llm_string()
+
+def lookup_cached_priority(inputs):
+    from langchain_core.globals import get_llm_cache
+    prompt, llm_string = llm_cache_key(inputs)  # builds the LLM first, which installs the cache
+    cached = get_llm_cache().lookup(prompt, llm_string)
+    return cached[0].text if cached else None
+
+def store_cached_priority(inputs, priority_output):
+    from langchain_core.globals import get_llm_cache
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration
+    prompt, llm_string = llm_cache_key(inputs)
+    get_llm_cache().update(prompt, llm_string, [ChatGeneration(message=AIMessage(content=priority_output))])
+
+def stream_priority(inputs):
+    yield from get_chain().stream(inputs)
+
+# Cap on in-flight OpenAI requests during batch assessment, to stay within rate limits
+BATCH_CONCURRENCY = 8
+
+@st.cache_data(ttl=60)
+def titles_and_map(issue_tuples):
+    # (title, position in the loaded issue list) pairs; positions keep the cache key hashable
+    return [t for t, _ in issue_tuples], dict(issue_tuples)
+
+def get_prios_by_name(jira):
+    # Priorities are static per Jira instance; resolve names to ids once per session
+    if "jira_prios_by_name" not in st.session_state:
+        st.session_state["jira_prios_by_name"] = {p.name.lower(): p.id for p in jira.priorities()}
+    return st.session_state["jira_prios_by_name"]
+
+def set_issue_priority(jira, issue_key, prio_id):
+    jira.issue(issue_key).update(fields={"priority": {"id": prio_id}})
+
+# Number of issues offered for prioritization, fetched in a single search request
+ISSUE_LIMIT = 20
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_issues(_jira, jira_host, jira_email, jira_project_key):
+    # The client is excluded from the cache key; host + user + project identify the result,
+    # so one user is never served issues fetched with another user's permissions.
+    # Plain dicts keep the cached value cheap to pickle.
+    jql = f'project={jira_project_key} ORDER BY created ASC'
+    return [
+        {"key": i.key, "summary": i.fields.summary, "description": i.fields.description}
+        for i in _jira.search_issues(jql, maxResults=ISSUE_LIMIT, fields="summary,description")
+    ]
+
+def render_connect_form():
+    if st.session_state.get("connected", False):
+        colc, cold = st.columns([10, 1])
+        with cold:
+            if st.button("Disconnect"):
+                clear_connection_state()
+                st.rerun()
+
+    if not st.session_state.get("connected", False):
+        st.subheader("Connect to Jira")
+        with st.form("connection_form"):
+            jira_host = st.text_input("Jira Host URL (e.g. https://yourdomain.atlassian.net)", value=st.session_state.get("jira_host", ""))
+            jira_email = st.text_input("Jira Email", value=st.session_state.get("jira_email", ""))
+            jira_api_token = st.text_input("Jira API Token", type="password", value=st.session_state.get("jira_api_token", ""))
+            jira_project_key = st.text_input("Jira Project Key", value=st.session_state.get("jira_project_key", ""))
+            submitted = st.form_submit_button("Connect")
+        if submitted:
+            if not (jira_host and jira_email and jira_api_token and jira_project_key):
+                st.warning("Please fill in all fields to connect.")
+            else:
+                st.session_state["jira_host"] = jira_host.strip()
+                st.session_state["jira_email"] = jira_email.strip()
+                st.session_state["jira_api_token"] = jira_api_token.strip()
+                st.session_state["jira_project_key"] = jira_project_key.strip()
+                try:
+                    from jira import JIRA
+                    jira = JIRA(server=jira_host, basic_auth=(jira_email, jira_api_token))
+                    st.session_state["jira_client"] = jira
+                    # Prefetch priorities; they only matter for the Update button, which retries on failure
+                    try:
+                        get_prios_by_name(jira)
+                    except Exception:
+                        pass
+                    st.session_state["connected"] = True
+                    st.success(f"Connected as {jira_email} to JIRA: {jira_project_key}")
+                except Exception as e:
+                    st.session_state["connected"] = False
+                    st.error(f"Failed to connect to Jira: {e}")
+    else:
+        st.success(
+            f"Connected as {st.session_state['jira_email']} to JIRA: {st.session_state['jira_project_key']}",
+            icon="🔗"
+        )
+
+    if st.session_state.get("connected", False):
+        return st.session_state["jira_client"]
+    return None
+
+def select_issue(jira):
+    try:
+        issues = load_issues(
+            jira, st.session_state["jira_host"], st.session_state["jira_email"], st.session_state["jira_project_key"]
+        )
+    except Exception as e:
+        st.error(f"Failed to load issues: {e}")
+        issues = []
+
+    if not issues:
+        st.warning("No issues found in the selected project.")
+        return issues, None
+
+    issue_titles, title_map = titles_and_map(
+        tuple((f"{i['key']}: {i['summary']}", n) for n, i in enumerate(issues))
+    )
+    selected = st.selectbox("Select a user story/task to prioritize:", issue_titles)
+    return issues, issues[title_map[selected]]
+
+def best_practices_panel(help_md):
+    with st.expander("Best practices for filling out these fields (Click to expand)", expanded=False):
+        st.markdown(help_md)
+
+def render_assessment(selected_issue, jira, extra_help_section=None, field_help=None):
+    story_input = f"{selected_issue['summary']}\n\n{selected_issue['description'] or ''}".strip()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("📝 Original Story/Task")
+        st.markdown(f"**Summary:** {selected_issue['summary']}")
+        st.markdown(f"**Description:** {selected_issue['description'] or ''}")
+
+    with col2:
+        st.subheader("🔎 Priority Assessment")
+
+        # Collapsible Best Practices Help Section
+        if extra_help_section:
+            best_practices_panel(extra_help_section)
+
+        field_help = field_help or {}
+        with st.form("priority_form", clear_on_submit=True):
+            business_value = st.text_area("Business Value / Customer Impact", help=field_help.get("business_value"))
+            deadline = st.text_input("Deadline / Time Sensitivity", help=field_help.get("deadline"))
+            dependencies = st.text_area("Dependencies (on/by other work)", help=field_help.get("dependencies"))
+            risk = st.text_area("Risk of delay or failure", help=field_help.get("risk"))
+            effort = st.text_input("Effort / Complexity", help=field_help.get("effort"))
+            other_context = st.text_area("Other context (optional)", help=field_help.get("other_context"))
+            submitted = st.form_submit_button("🟢 Assess Priority")
+            if submitted:
+                with st.spinner("Evaluating priority..."):
+                    inputs = {
+                        "user_story": story_input,
+                        "business_value": business_value,
+                        "deadline": deadline,
+                        "dependencies": dependencies,
+                        "risk": risk,
+                        "effort": effort,
+                        "other_context": other_context,
+                    }
+                    try:
+                        priority_output = lookup_cached_priority(inputs)
+                    except Exception:
+                        # An unreadable disk cache only costs a fresh OpenAI call
+                        priority_output = None
+                    if priority_output is None:
+                        # Render tokens as they arrive; replaced by the parsed result below
+                        stream_placeholder = st.empty()
+                        try:
+                            priority_output = stream_placeholder.write_stream(stream_priority(inputs))
+                        except Exception as e:
+                            st.error(f"OpenAI Error: {e}")
+                            priority_output = ""
+                        else:
+                            try:
+                                store_cached_priority(inputs, priority_output)
+                            except Exception:
+                                # The response is still shown; it just isn't persisted
+                                pass
+                        stream_placeholder.empty()
+                    # Parse the output
+                    m = PRIORITY_RE.search(priority_output)
+                    priority = m.group("prio").strip() if m else ""
+                    rationale = m.group("rat").strip() if m else ""
+                    st.markdown(f"**Priority Recommendation:** `{priority}`")
+                    st.markdown("**Rationale:**")
+                    st.markdown(rationale)
+                    # Store for update
+                    st.session_state["last_priority_recommendation"] = priority
+                    st.session_state["last_priority_rationale"] = rationale
+                    st.session_state["last_selected_issue_key"] = selected_issue["key"]
+
+        # Buttons to update Jira ticket priority field and/or add rationale as a comment (if recommended)
+        if (
+            st.session_state.get("last_priority_recommendation")
+            and st.session_state.get("last_selected_issue_key") == selected_issue["key"]
+        ):
+            update_clicked = st.button("⬆️ Update Jira Issue Priority", key="update_priority_btn")
+            comment_clicked = st.button("💬 Add Rationale as Jira Comment", key="add_comment_btn")
+            both_clicked = st.button("🚀 Update Priority & Add Comment", key="update_and_comment_btn")
+            do_update = update_clicked or both_clicked
+            do_comment = comment_clicked or both_clicked
+
+            prio_id = None
+            if do_update:
+                try:
+                    # Jira priorities are usually ("Highest", "High", "Medium", "Low", "Lowest")
+                    prio_map = {"High": "High", "Medium": "Medium", "Low": "Low"}
+                    priority_name = prio_map.get(st.session_state["last_priority_recommendation"].capitalize(), "Medium")
+                    # Find corresponding priority id (needed by Jira API), usually prefetched at connect time
+                    prio_id = get_prios_by_name(jira).get(priority_name.lower())
+                    if prio_id is None:
+                        st.warning("Could not map recommended priority to Jira priority field. Please set manually in Jira.")
+                except Exception as e:
+                    st.error(f"Failed to update Jira issue priority: {e}")
+
+            # Run the Jira writes concurrently so both actions cost a single round trip of wall time
+            if prio_id is not None or do_comment:
+                tasks = {}
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    if prio_id is not None:
+                        tasks[executor.submit(set_issue_priority, jira, selected_issue["key"], prio_id)] = "update"
+                    if do_comment:
+                        comment = f"AI Priority Recommendation: **{st.session_state['last_priority_recommendation']}**\n\nRationale:\n{st.session_state['last_priority_rationale']}"
+                        tasks[executor.submit(jira.add_comment, selected_issue["key"], comment)] = "comment"
+                    for future in as_completed(tasks):
+                        action = tasks[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            if action == "update":
+                                st.error(f"Failed to update Jira issue priority: {e}")
+                            else:
+                                st.error(f"Failed to add comment: {e}")
+                        else:
+                            if action == "update":
+                                st.success(f"Issue {selected_issue['key']} updated to priority: {priority_name}")
+                            else:
+                                st.success("Comment added to Jira ticket!")
+
+def render_batch_assessment(issues):
+    # Batch mode: assess every loaded issue concurrently from its summary/description alone
+    st.subheader("📋 Batch Assessment")
+    if st.button("⚡ Prioritize all", key="prioritize_all_btn"):
+        batch_rows = []
+        table_placeholder = st.empty()
+
+        def show_result(issue_key, priority_output, error):
+            m = PRIORITY_RE.search(priority_output)
+            batch_rows.append({
+                "Issue": issue_key,
+                "Priority": m.group("prio").strip() if m else "",
+                "Rationale": f"OpenAI Error: {error}" if error else (m.group("rat").strip() if m else ""),
+            })
+            table_placeholder.dataframe(batch_rows, use_container_width=True)
+
+        stories = {}
+        for i in issues:
+            inputs = {
+                "user_story": f"{i['summary']}\n\n{i['description'] or ''}".strip(),
+                "business_value": "",
+                "deadline": "",
+                "dependencies": "",
+                "risk": "",
+                "effort": "",
+                "other_context": "",
+            }
+            stories[i["key"]] = inputs
+
+        if stories:
+            issue_keys = list(stories)
+            with st.spinner(f"Evaluating {len(stories)} issues..."):
+                # Runs on the chain's own thread pool and yields each result as it completes;
+                # issues already in the on-disk LLM cache are answered without calling OpenAI
+                for n, result in get_chain().batch_as_completed(
+                    list(stories.values()),
+                    config={"max_concurrency": BATCH_CONCURRENCY},
+                    return_exceptions=True,
+                ):
+                    issue_key = issue_keys[n]
+                    if isinstance(result, Exception):
+                        show_result(issue_key, "", result)
+                    else:
+                        show_result(issue_key, result, None)